@@ -1,23 +1,42 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from datetime import datetime
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, field_validator
 from . import storage
-from typing import Optional
+from typing import Literal, NamedTuple, Optional
+from functools import lru_cache
+import threading
+import time
 
 
-app = FastAPI(title="Aurum_Solace Server")
+app = FastAPI(title="Aurum_Solace Server", default_response_class=ORJSONResponse)
 
 @app.on_event("startup")
 def on_startup():
     storage.init_db()
 
+
+@app.on_event("shutdown")
+def on_shutdown():
+    storage.flush_actuations()
+
 # -------------------------
 # Data model for mood input
 # -------------------------
+Mood = Literal["low", "neutral", "good"]
+Energy = Literal["low", "medium", "high"]
+Focus = Literal["drifting", "ok", "locked-in"]
+
+
 class MoodCheckIn(BaseModel):
-    mood: str        # "low", "neutral", "good"
-    energy: str      # "low", "medium", "high"
-    focus: str       # "drifting", "ok", "locked-in"
+    mood: Mood
+    energy: Energy
+    focus: Focus
+
+    @field_validator("mood", "energy", "focus", mode="before")
+    @classmethod
+    def _lowercase(cls, value):
+        # Normalise case once at ingress; everything downstream is lowercase
+        return value.lower() if isinstance(value, str) else value
 
 
 
@@ -44,66 +63,284 @@ class FeedbackIn(BaseModel):
 # -------------------------
 # suggestion logic
 # -------------------------
+_FALLBACK_SUGGESTION = "Start small — what is one simple action Future You would thank you for?"
+
+_LOW_MOOD_WITH_ENERGY = "Energy is present even if mood is low — try one tiny 5-minute task to regain control."
+_GOOD_CONDITIONS = "Great conditions today — move something meaningful forward with 20 minutes of deep focus."
+
+# (mood, energy, focus) -> suggestion. None in the energy or focus slot
+# matches any value; states without an entry get the fallback.
+_SUGGESTION_TABLE = {
+    ("low", "low", None): (
+        "You seem low today — pick the smallest act of self-care you can manage: a glass of water, a stretch, or one deep breath."
+    ),
+    ("low", "medium", None): _LOW_MOOD_WITH_ENERGY,
+    ("low", "high", None): _LOW_MOOD_WITH_ENERGY,
+    ("neutral", None, "drifting"): (
+        "You're steady but scattered — choose a single priority and work on it for 10 focused minutes."
+    ),
+    ("good", "medium", None): _GOOD_CONDITIONS,
+    ("good", "high", None): _GOOD_CONDITIONS,
+}
+
+
 def suggest_action(mood: str, energy: str, focus: str) -> str:
-    mood = mood.lower()
-    energy = energy.lower()
-    focus = focus.lower()
+    # Inputs are already lowercase (validated check-ins, inferred or stored states)
+    suggestion = _SUGGESTION_TABLE.get((mood, energy, None)) or _SUGGESTION_TABLE.get((mood, None, focus))
+    return suggestion or _FALLBACK_SUGGESTION
+
+
+
+# Streak-aware sentence appended to a coaching suggestion, keyed by
+# min(streak_days, 3); {days} is filled with the actual streak length.
+_STREAK_PHRASES = {
+    0: " Let's just focus on winning today with one meaningful action.",
+    1: " Good start — you're at {days} day of action. Let's keep it going.",
+    2: " Good start — you're at {days} day of action. Let's keep it going.",
+    3: " You're on a {days}-day streak. Protect it with one small action today.",
+}
+
+
+def _streak_phrase(streak_days: int) -> str:
+    return _STREAK_PHRASES.get(min(streak_days, 3), _STREAK_PHRASES[0]).format(days=streak_days)
+
+
+def _build_coach_payload(mood: str, energy: str, focus: str, timestamp: Optional[str]) -> dict:
+    """Suggestion for a state plus streak-aware nuance, shared by /coach and /checkin/text."""
+    streak_data = storage.get_action_streak()
+    suggestion = f"{suggest_action(mood, energy, focus)} {_streak_phrase(streak_data['streak_days'])}"
+
+    return {
+        "based_on": {
+            "timestamp": timestamp,
+            "mood": mood,
+            "energy": energy,
+            "focus": focus,
+        },
+        "streak": streak_data,
+        "suggestion": suggestion,
+    }
+
+
+
+# -------------------------
+# inference keywords
+# -------------------------
+_MOOD_LOW = ("sad", "down", "depressed", "empty", "tired of", "overwhelmed")
+_MOOD_GOOD = ("good", "great", "excited", "happy", "pumped", "optimistic")
 
-    if mood == "low" and energy == "low":
-        return "You seem low today — pick the smallest act of self-care you can manage: a glass of water, a stretch, or one deep breath."
+_ENERGY_LOW = ("exhausted", "drained", "tired", "low energy", "wiped")
+_ENERGY_HIGH = ("wired", "energized", "hyped", "ready to go", "full of energy")
 
-    if mood == "low" and energy in ("medium", "high"):
-        return "Energy is present even if mood is low — try one tiny 5-minute task to regain control."
+_FOCUS_DRIFTING = ("scattered", "can't focus", "distracted", "all over the place")
+_FOCUS_LOCKED_IN = ("locked in", "dialed in", "focused", "in the zone")
 
-    if mood == "neutral" and focus == "drifting":
-        return "You're steady but scattered — choose a single priority and work on it for 10 focused minutes."
 
-    if mood == "good" and energy in ("medium", "high"):
-        return "Great conditions today — move something meaningful forward with 20 minutes of deep focus."
+# (field, label, keywords) in priority order: the first matching rule for a
+# field wins, the same precedence as the old if/elif keyword checks.
+_STATE_RULES = (
+    ("mood", "low", _MOOD_LOW),
+    ("mood", "good", _MOOD_GOOD),
+    ("energy", "low", _ENERGY_LOW),
+    ("energy", "high", _ENERGY_HIGH),
+    ("focus", "drifting", _FOCUS_DRIFTING),
+    ("focus", "locked-in", _FOCUS_LOCKED_IN),
+)
 
-    return "Start small — what is one simple action Future You would thank you for?"
 
+class InferredState(NamedTuple):
+    mood: str
+    energy: str
+    focus: str
+    confidence: float
 
 
-def infer_state_from_text(text: str):
+# Only short texts are memoised: repeated check-ins are short, and the cache
+# must not pin arbitrarily large request bodies for the life of the process.
+_INFER_CACHE_MAX_LEN = 256
+
+
+def infer_state_from_text(text: str) -> InferredState:
     """
     Very simple rule-based classifier for now.
     Later, this is where a real LLM or model call will live.
+    Pure function of the text, so short texts are memoised (immutable tuple).
     """
+    if len(text) <= _INFER_CACHE_MAX_LEN:
+        return _infer_state_cached(text)
+    return _infer_state(text)
+
+
+def _infer_state(text: str) -> InferredState:
     t = text.lower()
 
     # Default values
-    mood = "neutral"
-    energy = "medium"
-    focus = "ok"
-    confidence = 0.4  # arbitrary baseline
-
-    # --- Mood keywords ---
-    if any(word in t for word in ["sad", "down", "depressed", "empty", "tired of", "overwhelmed"]):
-        mood = "low"
-        confidence = 0.7
-    elif any(word in t for word in ["good", "great", "excited", "happy", "pumped", "optimistic"]):
-        mood = "good"
-        confidence = 0.7
-
-    # --- Energy keywords ---
-    if any(word in t for word in ["exhausted", "drained", "tired", "low energy", "wiped"]):
-        energy = "low"
-    elif any(word in t for word in ["wired", "energized", "hyped", "ready to go", "full of energy"]):
-        energy = "high"
-
-    # --- Focus keywords ---
-    if any(word in t for word in ["scattered", "can't focus", "distracted", "all over the place"]):
-        focus = "drifting"
-    elif any(word in t for word in ["locked in", "dialed in", "focused", "in the zone"]):
-        focus = "locked-in"
+    state = {
+        "mood": "neutral",
+        "energy": "medium",
+        "focus": "ok",
+    }
+    matched = set()
+
+    for field, label, keywords in _STATE_RULES:
+        if field in matched:
+            continue
+        for w in keywords:
+            if w in t:
+                state[field] = label
+                matched.add(field)
+                break
+
+    # A mood keyword hit raises confidence over the arbitrary baseline
+    return InferredState(
+        mood=state["mood"],
+        energy=state["energy"],
+        focus=state["focus"],
+        confidence=0.7 if "mood" in matched else 0.4,
+    )
 
-    return {
-        "mood": mood,
-        "energy": energy,
-        "focus": focus,
-        "confidence": confidence,
+
+_infer_state_cached = lru_cache(maxsize=512)(_infer_state)
+
+
+
+# -------------------------
+# actuation rules
+# -------------------------
+# Ground state per device; each request copies only the devices it needs.
+_GROUND_LIGHTS = {
+    "scene": "neutral",
+    "color_temp_k": 2700,
+    "brightness": 45,
+    "effect": "steady",
+    "duration_s": 1800,
+}
+
+_GROUND_SPEAKER = {
+    "soundscape": "silence",
+    "volume": 20,
+    "fade_in_s": 5,
+    "duration_s": 0,
+}
+
+_GROUND_ROBOT = {
+    "script": "idle_presence",
+    "tone": "calm",
+    "line": None,
+    "task": None,
+    "timer_s": None,
+}
+
+_GROUND_STATE = {
+    "lights": _GROUND_LIGHTS,
+    "speaker": _GROUND_SPEAKER,
+    "robot": _GROUND_ROBOT,
+}
+
+# (mood, energy, focus) -> {device: patch} applied over the ground state.
+# A focus of None matches any focus, including values outside the Focus
+# literal from older rows. States without an entry stay on the ground state.
+_ACTUATION_RULES = {
+    ("low", "low", None): {
+        "lights": {
+            "scene": "ember",
+            "color_temp_k": 2200,
+            "brightness": 20,
+            "effect": "breathe",
+            "duration_s": 900,
+        },
+        "speaker": {
+            "soundscape": "rain_soft",
+            "volume": 22,
+            "fade_in_s": 8,
+            "duration_s": 600,
+        },
+        "robot": {
+            "script": "micro_step_support",
+            "tone": "soft",
+            "line": "We go small. Stand up. Drink water. One minute.",
+            "task": "drink_water",
+            "timer_s": 60,
+        },
+    },
+}
+
+
+def _device_command(device: str, mood: str, energy: str, focus: str, streak_days: int) -> dict:
+    """Build one device's command: ground state, rule patch, then streak nuance."""
+    command = _GROUND_STATE[device].copy()
+
+    patch = _ACTUATION_RULES.get((mood, energy, focus)) or _ACTUATION_RULES.get((mood, energy, None))
+    if patch is not None and device in patch:
+        command.update(patch[device])
+
+    if device == "robot" and streak_days >= 3:
+        command["script"] = f"{command['script']}_protect_streak"
+
+    return command
+
+
+def _log_actuation(mood: str, energy: str, focus: str, streak_days: int, commands: dict, device: Optional[str]):
+    """Store the full decision, building any devices the request did not need."""
+    full = {
+        name: commands[name] if name in commands else _device_command(name, mood, energy, focus, streak_days)
+        for name in _GROUND_STATE
     }
+    storage.queue_actuation(
+        mood=mood,
+        energy=energy,
+        focus=focus,
+        streak_days=streak_days,
+        lights=full["lights"],
+        speaker=full["speaker"],
+        robot=full["robot"],
+        requested_device=device,
+    )
+
+
+
+# -------------------------
+# actuate response cache
+# -------------------------
+# Short-lived cache of /actuate responses, so a device polling in a loop does
+# not re-read the state, recompute (and re-log) the same decision on every
+# request. Mood check-ins and action logs bump the generation, which retires
+# every entry, including one being built from the old state concurrently.
+_ACTUATE_CACHE_TTL_S = 5.0
+_ACTUATE_CACHE_MAXSIZE = 64
+_actuate_cache = {}  # key -> (expires_at, response)
+_actuate_cache_lock = threading.Lock()
+_actuate_cache_generation = 0
+
+
+def _actuate_cache_get(key):
+    with _actuate_cache_lock:
+        entry = _actuate_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _actuate_cache[key]
+            return None
+        return entry[1]
+
+
+def _actuate_cache_put(key, response):
+    with _actuate_cache_lock:
+        now = time.monotonic()
+        if len(_actuate_cache) >= _ACTUATE_CACHE_MAXSIZE:
+            # Drop expired entries first, then the oldest if still full
+            for k in [k for k, (expires_at, _) in _actuate_cache.items() if expires_at <= now]:
+                del _actuate_cache[k]
+            if len(_actuate_cache) >= _ACTUATE_CACHE_MAXSIZE:
+                del _actuate_cache[next(iter(_actuate_cache))]
+        _actuate_cache[key] = (now + _ACTUATE_CACHE_TTL_S, response)
+
+
+def _actuate_cache_invalidate():
+    global _actuate_cache_generation
+    with _actuate_cache_lock:
+        _actuate_cache_generation += 1
+        _actuate_cache.clear()
 
 
 
@@ -125,6 +362,7 @@ def checkin_mood(data: MoodCheckIn):
         energy=data.energy,
         focus=data.focus, 
     )
+    _actuate_cache_invalidate()
 
     suggestion = suggest_action(data.mood, data.energy, data.focus)
 
@@ -141,6 +379,7 @@ def log_action(data: ActionLog):
         action=data.action,
         success=data.success
     )
+    _actuate_cache_invalidate()
 
 
     return {
@@ -184,48 +423,13 @@ def coach():
 
     last = history[0]
 
-    # Use correct keys from the DB rows
-    mood = last.get("mood", "neutral")
-    energy = last.get("energy", "medium")
-    focus = last.get("focus", "ok")
-
-    # 2) Base suggestion from mood
-    base_suggestion = suggest_action(
-        mood=mood,
-        energy=energy,
-        focus=focus,
+    return _build_coach_payload(
+        mood=last.get("mood", "neutral"),
+        energy=last.get("energy", "medium"),
+        focus=last.get("focus", "ok"),
+        timestamp=last.get("timestamp"),
     )
 
-    # 3) Pull current streak
-    streak_info = getattr(storage, "get_action_streak", None)
-    if callable(streak_info):
-        streak_data = storage.get_action_streak()
-    else:
-        streak_data = {"streak_days": 0, "last_action_date": None}
-
-    streak_days = streak_data.get("streak_days", 0)
-
-    # 4) Add streak-aware nuance
-    if streak_days >= 3:
-        extra = f" You're on a {streak_days}-day streak. Protect it with one small action today."
-    elif streak_days == 1 or streak_days == 2:
-        extra = f" Good start — you're at {streak_days} day of action. Let's keep it going."
-    else:
-        extra = " Let's just focus on winning today with one meaningful action."
-
-    suggestion = f"{base_suggestion} {extra}"
-
-    return {
-        "based_on": {
-            "timestamp": last.get("timestamp"),
-            "mood": mood,
-            "energy": energy,
-            "focus": focus,
-        },
-        "streak": streak_data,
-        "suggestion": suggestion,
-    }
-
 
 @app.post("/infer/mood", description="Infer mood, energy, and focus from free-form text.")
 def infer_mood(data: MoodTextIn):
@@ -233,10 +437,10 @@ def infer_mood(data: MoodTextIn):
 
     return {
         "input_text": data.text,
-        "mood": result["mood"],
-        "energy": result["energy"],
-        "focus": result["focus"],
-        "confidence": result["confidence"],
+        "mood": result.mood,
+        "energy": result.energy,
+        "focus": result.focus,
+        "confidence": result.confidence,
     }
 
 
@@ -245,9 +449,7 @@ def checkin_text(data: MoodTextIn):
     # 1) Infer state from text
     inferred = infer_state_from_text(data.text)
 
-    mood = inferred["mood"]
-    energy = inferred["energy"]
-    focus = inferred["focus"]
+    mood, energy, focus, confidence = inferred
 
     # 2) Store in DB using your existing storage function
     entry = storage.insert_mood(
@@ -255,27 +457,10 @@ def checkin_text(data: MoodTextIn):
         energy=energy,
         focus=focus,
     )
+    _actuate_cache_invalidate()
 
-    # 3) Generate coaching suggestion
-    base_suggestion = suggest_action(mood=mood, energy=energy, focus=focus)
-
-    # 4) (Optional) streak-aware add-on
-    streak_info = getattr(storage, "get_action_streak", None)
-    if callable(streak_info):
-        streak_data = storage.get_action_streak()
-    else:
-        streak_data = {"streak_days": 0, "last_action_date": None}
-
-    streak_days = streak_data.get("streak_days", 0)
-
-    if streak_days >= 3:
-        extra = f" You're on a {streak_days}-day streak. Protect it with one small action today."
-    elif streak_days in (1, 2):
-        extra = f" Good start — you're at {streak_days} day of action. Let's keep it going."
-    else:
-        extra = " Let's just focus on winning today with one meaningful action."
-
-    suggestion = f"{base_suggestion} {extra}"
+    # 3) Coaching suggestion with streak-aware add-on
+    coaching = _build_coach_payload(mood, energy, focus, entry["timestamp"])
 
     return {
         "status": "stored",
@@ -284,11 +469,11 @@ def checkin_text(data: MoodTextIn):
             "mood": mood,
             "energy": energy,
             "focus": focus,
-            "confidence": inferred.get("confidence", 0.0),
+            "confidence": confidence,
         },
         "entry": entry,
-        "streak": streak_data,
-        "suggestion": suggestion,
+        "streak": coaching["streak"],
+        "suggestion": coaching["suggestion"],
     }
 
 
@@ -297,15 +482,11 @@ def status():
     latest_mood = storage.get_latest_mood()
     counts = storage.get_summary()
 
-    streak_info = getattr(storage, "get_action_streak", None)
-    if callable(streak_info):
-        streak = storage.get_action_streak()
-    else:
-        streak = {"streak_days": 0, "last_action_date": None}
+    streak = storage.get_action_streak()
 
     return {
         "server": "online",
-        "utc_time": datetime.utcnow().isoformat(),
+        "utc_time": storage.utc_now_iso(),
         "latest_mood": latest_mood,
         "streak": streak,
         "counts": counts,
@@ -313,7 +494,14 @@ def status():
 
 
 @app.get("/actuate", description="Return recommended actions for lights/speaker/robot based on latest state.")
-def actuate(device: Optional[str] = None):
+def actuate(background_tasks: BackgroundTasks, device: Optional[str] = None):
+    # Devices poll this endpoint; repeat the recent answer while nothing was
+    # logged. The UTC day is part of the key because the streak depends on it.
+    cache_key = (_actuate_cache_generation, int(time.time() // 86_400), device)
+    cached = _actuate_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     # 1) Get latest mood state (fallbacks if none yet)
     history = storage.get_mood_history(limit=1)
     last = history[0] if history else None
@@ -322,104 +510,44 @@ def actuate(device: Optional[str] = None):
     energy = (last.get("energy") if last else "medium")
     focus = (last.get("focus") if last else "ok")
 
-    # 2) Streak (optional)
-    streak_info = getattr(storage, "get_action_streak", None)
-    if callable(streak_info):
-        streak = storage.get_action_streak()
+    # 2) Streak
+    streak_days = storage.get_action_streak()["streak_days"]
+
+    # 3) Commands from ground state + rules (simple now, ML later), built
+    # only for the requested device
+    if device:
+        d = device.lower().strip()
+        devices = (d,) if d in _GROUND_STATE else ()
     else:
-        streak = {"streak_days": 0, "last_action_date": None}
-    streak_days = streak.get("streak_days", 0)
-
-    # 3) Ground State
-    lights = {
-        "scene": "neutral",
-        "color_temp_k": 2700,
-        "brightness": 45,
-        "effect": "steady",
-        "duration_s": 1800,
-    }
+        devices = tuple(_GROUND_STATE)
 
-    speaker = {
-        "soundscape": "silence",
-        "volume": 20,
-        "fade_in_s": 5,
-        "duration_s": 0,
+    commands = {
+        name: _device_command(name, mood, energy, focus, streak_days)
+        for name in devices
     }
 
-    robot = {
-        "script": "idle_presence",
-        "tone": "calm",
-        "line": None,
-        "task": None,
-        "timer_s": None,
-    }
+    # Logged after the response is sent; storage batches the actual writes
+    background_tasks.add_task(_log_actuation, mood, energy, focus, streak_days, commands, device)
 
-    # 4) Rules (simple now, ML later)
-    if mood == "low" and energy == "low":
-        lights.update({
-            "scene": "ember",
-            "color_temp_k": 2200,
-            "brightness": 20,
-            "effect": "breathe",
-            "duration_s": 900,
-        })
-        speaker.update({
-            "soundscape": "rain_soft",
-            "volume": 22,
-            "fade_in_s": 8,
-            "duration_s": 600,
-        })
-        robot.update({
-            "script": "micro_step_support",
-            "tone": "soft",
-            "line": "We go small. Stand up. Drink water. One minute.",
-            "task": "drink_water",
-            "timer_s": 60,
-        })
-
-
-    # 5) Streak nuance
-    if streak_days >= 3:
-        robot["script"] = f"{robot['script']}_protect_streak"
-
-    storage.insert_actuation(
-        mood=mood,
-        energy=energy,
-        focus=focus,
-        streak_days=streak_days,
-        lights=lights,
-        speaker=speaker,
-        robot=robot,
-        requested_device=device,
-    )
-
-
-    response = {
-        "version": "0.1.0",
-        "node": "aurum-brain-1",
-        "based_on": {
-            "timestamp": (last.get("timestamp") if last else None),
-            "mood": mood,
-            "energy": energy,
-            "focus": focus,
-            "streak_days": streak_days,
-        },
-        "commands": {
-            "lights": lights,
-            "speaker": speaker,
-            "robot": robot,
-        },
-    }
-
-    if device:
-        d = device.lower().strip()
-        if d in response["commands"]:
-            response["commands"] = {d: response["commands"][d]}
-        else:
-            return {
-                "error": f"Unknown device '{device}'. Use lights, speaker, or robot."
-            }
+    if device and not commands:
+        response = {
+            "error": f"Unknown device '{device}'. Use lights, speaker, or robot."
+        }
+    else:
+        response = {
+            "version": "0.1.0",
+            "node": "aurum-brain-1",
+            "based_on": {
+                "timestamp": (last.get("timestamp") if last else None),
+                "mood": mood,
+                "energy": energy,
+                "focus": focus,
+                "streak_days": streak_days,
+            },
+            "commands": commands,
+        }
 
+    _actuate_cache_put(cache_key, response)
     return response
 
 @app.post("/feedback", description="Log whether the last actuation helped.")
@@ -1,50 +1,61 @@
 import sqlite3
 from pathlib import Path
-from datetime import datetime, date, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
+from collections import deque
 import json
+import logging
+import threading
+import time
 
 DB_PATH = Path("aurum.db")
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row   # Access columns by name
-    return conn
+logger = logging.getLogger(__name__)
 
+# One connection per thread, opened on first use and kept for the life of
+# the thread (FastAPI runs sync endpoints on a worker thread pool).
+_local = threading.local()
 
-def init_db() -> None:
-    """Create required tables if they don't exist."""
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS mood_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
-            mood TEXT NOT NULL,
-            energy TEXT NOT NULL,
-            focus TEXT NOT NULL
-        );
-        """
-    )
+# Size of each connection's prepared-statement cache. The SQL below lives in
+# module-level constants so every call hands sqlite3 the same string and
+# hits that cache instead of re-parsing.
+_CACHED_STATEMENTS = 256
 
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS action_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
-            action TEXT NOT NULL,
-            success INTEGER NOT NULL
-        );
-        """
-    )
+# Let the WAL absorb write bursts and fold them back into the database every
+# ~1000 pages instead of syncing the main file on each commit.
+_WAL_AUTOCHECKPOINT_PAGES = 1000
 
-    cur.execute(
-    """
+# Timestamps are stored as INTEGER microseconds since the Unix epoch (UTC)
+# and only formatted as ISO-8601 strings on the way out.
+_US_PER_DAY = 86_400_000_000
+_EPOCH = datetime(1970, 1, 1)
+
+# -------------------------
+# SQL statements
+# -------------------------
+_SQL_CREATE_MOOD_LOGS = """
+    CREATE TABLE IF NOT EXISTS mood_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        mood TEXT NOT NULL,
+        energy TEXT NOT NULL,
+        focus TEXT NOT NULL
+    );
+"""
+
+_SQL_CREATE_ACTION_LOGS = """
+    CREATE TABLE IF NOT EXISTS action_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        action TEXT NOT NULL,
+        success INTEGER NOT NULL
+    );
+"""
+
+_SQL_CREATE_ACTUATION_LOGS = """
     CREATE TABLE IF NOT EXISTS actuation_logs (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
-        timestamp TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
         mood TEXT NOT NULL,
         energy TEXT NOT NULL,
         focus TEXT NOT NULL,
@@ -52,44 +63,262 @@ def init_db() -> None:
         lights_json TEXT NOT NULL,
         speaker_json TEXT NOT NULL,
         robot_json TEXT NOT NULL
-        );
-        """
-    )
+    );
+"""
 
-    cur.execute(
-    """
+_SQL_CREATE_FEEDBACK_LOGS = """
     CREATE TABLE IF NOT EXISTS feedback_logs (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
-        timestamp TEXT NOT NULL,
-        actuation_timestamp TEXT,
+        timestamp INTEGER NOT NULL,
+        actuation_timestamp INTEGER,
         helped INTEGER NOT NULL,
         note TEXT
     );
+"""
+
+# Newest-first reads walk these indexes instead of sorting the table; the
+# mood/action ones also carry the selected columns so they cover the
+# history queries without touching the table rows.
+_SQL_CREATE_INDEXES = (
+    """
+    CREATE INDEX IF NOT EXISTS idx_mood_ts
+    ON mood_logs (timestamp DESC, mood, energy, focus);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_action_ts
+    ON action_logs (timestamp DESC, action, success);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_action_success_ts
+    ON action_logs (success, timestamp DESC);
+    """,
     """
+    CREATE INDEX IF NOT EXISTS idx_actuation_ts
+    ON actuation_logs (timestamp DESC);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_feedback_ts
+    ON feedback_logs (timestamp DESC);
+    """,
 )
+
+# table -> (create statement, timestamp columns, columns lowercased on
+# migration). Check-ins are validated lowercase now, but older rows may hold
+# "LOW"/"Low" from before that, and suggestion/actuation lookups are exact.
+_TABLES = {
+    "mood_logs": (_SQL_CREATE_MOOD_LOGS, ("timestamp",), ("mood", "energy", "focus")),
+    "action_logs": (_SQL_CREATE_ACTION_LOGS, ("timestamp",), ()),
+    "actuation_logs": (_SQL_CREATE_ACTUATION_LOGS, ("timestamp",), ()),
+    "feedback_logs": (_SQL_CREATE_FEEDBACK_LOGS, ("timestamp", "actuation_timestamp"), ()),
+}
+
+_SQL_INSERT_MOOD = """
+    INSERT INTO mood_logs (timestamp, mood, energy, focus)
+    VALUES (?, ?, ?, ?);
+"""
+
+_SQL_INSERT_ACTION = """
+    INSERT INTO action_logs (timestamp, action, success)
+    VALUES (?, ?, ?);
+"""
+
+_SQL_COUNT_MOODS = "SELECT COUNT(*) FROM mood_logs;"
+
+_SQL_COUNT_ACTIONS = "SELECT COUNT(*) FROM action_logs;"
+
+_SQL_MOOD_HISTORY = """
+    SELECT timestamp, mood, energy, focus
+    FROM mood_logs
+    ORDER BY timestamp DESC
+    LIMIT ?;
+"""
+
+_SQL_ACTION_HISTORY = """
+    SELECT timestamp, action, success
+    FROM action_logs
+    ORDER BY timestamp DESC
+    LIMIT ?;
+"""
+
+_SQL_LATEST_ACTUATION_TIMESTAMP = """
+    SELECT timestamp
+    FROM actuation_logs
+    ORDER BY timestamp DESC
+    LIMIT 1;
+"""
+
+_SQL_INSERT_FEEDBACK = """
+    INSERT INTO feedback_logs (timestamp, actuation_timestamp, helped, note)
+    VALUES (?, ?, ?, ?);
+"""
+
+_SQL_FEEDBACK_HISTORY = """
+    SELECT timestamp, actuation_timestamp, helped, note
+    FROM feedback_logs
+    ORDER BY timestamp DESC
+    LIMIT ?;
+"""
+
+# Successful action timestamps, newest first, read straight off
+# idx_action_success_ts (no sort), so the caller can stop at any row.
+_SQL_SUCCESSFUL_ACTION_TIMESTAMPS = """
+    SELECT timestamp
+    FROM action_logs
+    WHERE success = 1
+    ORDER BY timestamp DESC;
+"""
+
+_SQL_LATEST_MOOD = """
+    SELECT timestamp, mood, energy, focus
+    FROM mood_logs
+    ORDER BY timestamp DESC
+    LIMIT 1;
+"""
+
+_SQL_INSERT_ACTUATION = """
+    INSERT INTO actuation_logs (
+        timestamp, mood, energy, focus, streak_days,
+        lights_json, speaker_json, robot_json
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+"""
+
+_SQL_ACTUATION_HISTORY = """
+    SELECT timestamp, mood, energy, focus, streak_days,
+           lights_json, speaker_json, robot_json
+    FROM actuation_logs
+    ORDER BY timestamp DESC
+    LIMIT ?;
+"""
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string, the format returned by the API."""
+    return datetime.utcnow().isoformat()
+
+
+def _now_us() -> int:
+    """Current UTC time as integer microseconds since the epoch (stored form)."""
+    return time.time_ns() // 1000
+
+
+def _us_to_iso(us: int) -> str:
+    """Format stored microseconds as the ISO-8601 string the API returns."""
+    return (_EPOCH + timedelta(microseconds=us)).isoformat()
+
+
+def _iso_to_us(ts: str) -> int:
+    """Parse a legacy ISO-8601 TEXT timestamp (naive UTC) into microseconds."""
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = dt - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _connect(check_same_thread: bool = True) -> sqlite3.Connection:
+    # Writes start with BEGIN IMMEDIATE so each connection takes the write
+    # lock up front (waiting out other writers via the busy timeout) instead
+    # of failing mid-transaction when a read upgrades to a write.
+    conn = sqlite3.connect(
+        DB_PATH,
+        cached_statements=_CACHED_STATEMENTS,
+        check_same_thread=check_same_thread,
+        isolation_level="IMMEDIATE",
+    )
+    # No row_factory: rows come back as plain tuples and are unpacked by
+    # position, which is cheaper than sqlite3.Row name lookups
+    # Per-connection tuning; journal_mode=WAL is persisted by init_db()
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-20000;")
+    conn.execute(f"PRAGMA wal_autocheckpoint={_WAL_AUTOCHECKPOINT_PAGES};")
+    return conn
+
+
+def get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+    return conn
+
+
+def _migrate_text_timestamps(conn: sqlite3.Connection, table: str) -> None:
+    """Rebuild a table created with TEXT timestamps using INTEGER microseconds."""
+    create_sql, ts_columns, lower_columns = _TABLES[table]
+    legacy = f"{table}_legacy"
+
+    with conn:
+        # Check under the write lock: another process starting at the same
+        # time may have finished the rebuild while this one waited for it
+        conn.execute("BEGIN IMMEDIATE;")
+        info = conn.execute(f"PRAGMA table_info({table});").fetchall()
+        # table_info rows: (cid, name, type, notnull, dflt_value, pk)
+        if not any(col[1] == "timestamp" and col[2].upper() == "TEXT" for col in info):
+            return
+
+        columns = [col[1] for col in info]
+        ts_indexes = [columns.index(name) for name in ts_columns]
+        # Unparsable timestamps become NULL where allowed, else 0 (the epoch,
+        # so they sort last in newest-first reads) rather than blocking startup
+        ts_fallback = {i: 0 if info[i][3] else None for i in ts_indexes}
+        lower_indexes = [columns.index(name) for name in lower_columns]
+        column_list = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+
+        conn.execute(f"ALTER TABLE {table} RENAME TO {legacy};")
+        conn.execute(create_sql)
+
+        rows = []
+        for row in conn.execute(f"SELECT {column_list} FROM {legacy};"):
+            values = list(row)
+            for i in ts_indexes:
+                # Only ISO strings are converted; anything else is kept as is
+                if isinstance(values[i], str):
+                    try:
+                        values[i] = _iso_to_us(values[i])
+                    except ValueError:
+                        logger.warning(
+                            "%s row %s: unparsable %s %r, stored as %r",
+                            table, values[0], columns[i], values[i], ts_fallback[i],
+                        )
+                        values[i] = ts_fallback[i]
+            for i in lower_indexes:
+                values[i] = values[i].lower()
+            rows.append(values)
+
+        conn.executemany(
+            f"INSERT INTO {table} ({column_list}) VALUES ({placeholders});",
+            rows,
+        )
+        conn.execute(f"DROP TABLE {legacy};")
+
+
+def init_db() -> None:
+    """Create required tables if they don't exist (migrating TEXT timestamps)."""
+    conn = get_connection()
+    conn.execute("PRAGMA journal_mode=WAL;")
+
+    for table, (create_sql, _, _) in _TABLES.items():
+        conn.execute(create_sql)
+        _migrate_text_timestamps(conn, table)
+
+    for create_index_sql in _SQL_CREATE_INDEXES:
+        conn.execute(create_index_sql)
     conn.commit()
-    conn.close()
 
 
 def insert_mood(mood: str, energy: str, focus: str) -> Dict[str, Any]:
     """Store a mood check-in and return it as a dict."""
     conn = get_connection()
-    cur = conn.cursor()
-    ts = datetime.utcnow().isoformat()
-
-    cur.execute(
-        """
-        INSERT INTO mood_logs (timestamp, mood, energy, focus)
-        VALUES (?, ?, ?, ?);
-        """,
-        (ts, mood, energy, focus),
-    )
+    us = _now_us()
 
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(_SQL_INSERT_MOOD, (us, mood, energy, focus))
 
     return {
-        "timestamp": ts,
+        "timestamp": _us_to_iso(us),
         "mood": mood,
         "energy": energy,
         "focus": focus,
@@ -99,22 +328,13 @@ def insert_mood(mood: str, energy: str, focus: str) -> Dict[str, Any]:
 def insert_action(action: str, success: bool) -> Dict[str, Any]:
     """Store an action log and return it as a dict."""
     conn = get_connection()
-    cur = conn.cursor()
-    ts = datetime.utcnow().isoformat()
-
-    cur.execute(
-        """
-        INSERT INTO action_logs (timestamp, action, success)
-        VALUES (?, ?, ?);
-        """,
-        (ts, action, int(success)),
-    )
+    us = _now_us()
 
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(_SQL_INSERT_ACTION, (us, action, int(success)))
 
     return {
-        "timestamp": ts,
+        "timestamp": _us_to_iso(us),
         "action": action,
         "success": success,
     }
@@ -123,15 +343,9 @@ def insert_action(action: str, success: bool) -> Dict[str, Any]:
 def get_summary() -> Dict[str, Any]:
     """Return simple counts of stored moods and actions."""
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("SELECT COUNT(*) AS c FROM mood_logs;")
-    mood_entries = cur.fetchone()["c"]
 
-    cur.execute("SELECT COUNT(*) AS c FROM action_logs;")
-    action_entries = cur.fetchone()["c"]
-
-    conn.close()
+    (mood_entries,) = conn.execute(_SQL_COUNT_MOODS).fetchone()
+    (action_entries,) = conn.execute(_SQL_COUNT_ACTIONS).fetchone()
 
     return {
         "mood_entries": mood_entries,
@@ -141,109 +355,67 @@ def get_summary() -> Dict[str, Any]:
 def get_mood_history(limit: int = 20) -> List[Dict[str, Any]]:
     # Return the most recent mood entries, newest first.
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """ 
-        SELECT timestamp, mood, energy, focus
-        FROM mood_logs
-        ORDER By timestamp DESC
-        LIMIT ?;
-        """,
-        (limit,),
-    )
 
-    rows = cur.fetchall()
-    conn.close()
-
-    # Convert sqlite3.Row objects to plain dicts
+    # Convert row tuples to plain dicts
     history = []
-    for row in rows:
+    for ts, mood, energy, focus in conn.execute(_SQL_MOOD_HISTORY, (limit,)):
         history.append(
             {
-                "timestamp": row["timestamp"],
-                "mood": row["mood"],
-                "energy": row["energy"],
-                "focus": row["focus"],
+                "timestamp": _us_to_iso(ts),
+                "mood": mood,
+                "energy": energy,
+                "focus": focus,
             }
         )
-    
+
     return history
 
 def get_action_history(limit: int = 20) -> List[Dict[str, Any]]:
     """Return the most recent action entries, newest first."""
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT timestamp, action, success
-        FROM action_logs
-        ORDER BY timestamp DESC
-        LIMIT ?;
-        """,
-        (limit,),
-    )
-
-    rows = cur.fetchall()
-    conn.close()
 
     history = []
-    for row in rows:
+    for ts, action, success in conn.execute(_SQL_ACTION_HISTORY, (limit,)):
         history.append(
             {
-                "timestamp": row["timestamp"],
-                "action": row["action"],
-                "success": bool(row["success"]),
+                "timestamp": _us_to_iso(ts),
+                "action": action,
+                "success": bool(success),
             }
         )
 
     return history
 
-def get_latest_actuation_timestamp() -> str | None:
-    """Return the most recent actuation timestamp or None."""
+def _latest_actuation_us() -> int | None:
+    flush_actuations()
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT timestamp
-        FROM actuation_logs
-        ORDER BY timestamp DESC
-        LIMIT 1;
-        """
-    )
-    row = cur.fetchone()
-    conn.close()
+    row = conn.execute(_SQL_LATEST_ACTUATION_TIMESTAMP).fetchone()
 
     if row is None:
         return None
 
-    return row["timestamp"]
+    return row[0]
+
+
+def get_latest_actuation_timestamp() -> str | None:
+    """Return the most recent actuation timestamp or None."""
+    act_us = _latest_actuation_us()
+    return _us_to_iso(act_us) if act_us is not None else None
 
 
 def insert_feedback(helped: bool, note: str | None = None) -> Dict[str, Any]:
     """Store feedback and attach it to the latest actuation."""
     conn = get_connection()
-    cur = conn.cursor()
-    ts = datetime.utcnow().isoformat()
+    us = _now_us()
 
-    act_ts = get_latest_actuation_timestamp()
+    act_us = _latest_actuation_us()
 
-    cur.execute(
-        """
-        INSERT INTO feedback_logs (timestamp, actuation_timestamp, helped, note)
-        VALUES (?, ?, ?, ?);
-        """,
-        (ts, act_ts, int(helped), note),
-    )
-
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(_SQL_INSERT_FEEDBACK, (us, act_us, int(helped), note))
 
     return {
-        "timestamp": ts,
-        "actuation_timestamp": act_ts,
+        "timestamp": _us_to_iso(us),
+        "actuation_timestamp": _us_to_iso(act_us) if act_us is not None else None,
         "helped": helped,
         "note": note,
     }
@@ -252,29 +424,15 @@ def insert_feedback(helped: bool, note: str | None = None) -> Dict[str, Any]:
 def get_feedback_history(limit: int = 20) -> List[Dict[str, Any]]:
     """Return recent feedback entries, newest first."""
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT timestamp, actuation_timestamp, helped, note
-        FROM feedback_logs
-        ORDER BY timestamp DESC
-        LIMIT ?;
-        """,
-        (limit,),
-    )
-
-    rows = cur.fetchall()
-    conn.close()
 
     history = []
-    for r in rows:
+    for ts, act_ts, helped, note in conn.execute(_SQL_FEEDBACK_HISTORY, (limit,)):
         history.append(
             {
-                "timestamp": r["timestamp"],
-                "actuation_timestamp": r["actuation_timestamp"],
-                "helped": bool(r["helped"]),
-                "note": r["note"],
+                "timestamp": _us_to_iso(ts),
+                "actuation_timestamp": _us_to_iso(act_ts) if act_ts is not None else None,
+                "helped": bool(helped),
+                "note": note,
             }
         )
 
@@ -287,69 +445,41 @@ def get_action_streak() -> Dict[str, Any]:
     Streak is counted backwards from today (UTC) as consecutive days.
     """
     conn = get_connection()
-    cur = conn.cursor()
-
-    # Get all successful actions ordered from newest to oldest
-    cur.execute(
-        """
-        SELECT timestamp
-        FROM action_logs
-        WHERE success = 1
-        ORDER BY timestamp DESC;
-        """
-    )
 
-    rows = cur.fetchall()
-    conn.close()
+    # Walk the index newest first, one day number per row; repeated days are
+    # skipped here and reading stops as soon as the streak breaks
+    cur = conn.execute(_SQL_SUCCESSFUL_ACTION_TIMESTAMPS)
 
-    if not rows:
-        return {
-            "streak_days": 0,
-            "last_action_date": None,
-        }
-
-    # Collect unique dates (in UTC) where successful actions happened
-    unique_dates = []
-    seen = set()
+    last_day = None
+    prev_day = None
+    streak = 0
+    expected = _now_us() // _US_PER_DAY
 
-    for row in rows:
-        ts_str = row["timestamp"]
-        try:
-            dt = datetime.fromisoformat(ts_str)
-        except ValueError:
-            # If parsing fails for some reason, skip this row
+    for (ts,) in cur:
+        day = ts // _US_PER_DAY
+        if day == prev_day:
             continue
+        prev_day = day
 
-        d = dt.date()
-        if d not in seen:
-            seen.add(d)
-            unique_dates.append(d)
-
-    if not unique_dates:
-        return {
-            "streak_days": 0,
-            "last_action_date": None,
-        }
-
-    # Sort dates from newest to oldest (should already be, but just in case)
-    unique_dates.sort(reverse=True)
-
-    today = date.today()
-    streak = 0
-    expected = today
+        if last_day is None:
+            last_day = day
 
-    for d in unique_dates:
-        if d == expected:
+        if day == expected:
             streak += 1
-            expected = expected - timedelta(days=1)
-        elif d > expected:
+            expected -= 1
+        elif day > expected:
             # Action logged in "future" relative to today (rare) - skip those
             continue
         else:
             # There's a gap; streak ends
             break
+    cur.close()
 
-    last_action_date = unique_dates[0].isoformat()
+    last_action_date = (
+        (_EPOCH.date() + timedelta(days=last_day)).isoformat()
+        if last_day is not None
+        else None
+    )
 
     return {
         "streak_days": streak,
@@ -361,27 +491,17 @@ def get_action_streak() -> Dict[str, Any]:
 def get_latest_mood() -> Dict[str, Any] | None:
     """Return the most recent mood entry or None if no data."""
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT timestamp, mood, energy, focus
-        FROM mood_logs
-        ORDER BY timestamp DESC
-        LIMIT 1;
-        """
-    )
-    row = cur.fetchone()
-    conn.close()
+    row = conn.execute(_SQL_LATEST_MOOD).fetchone()
 
     if row is None:
         return None
 
+    ts, mood, energy, focus = row
     return {
-        "timestamp": row["timestamp"],
-        "mood": row["mood"],
-        "energy": row["energy"],
-        "focus": row["focus"],
+        "timestamp": _us_to_iso(ts),
+        "mood": mood,
+        "energy": energy,
+        "focus": focus,
     }
 
 
@@ -405,34 +525,25 @@ def insert_actuation(
 ) -> Dict[str, Any]:
     """Store an actuation decision and return the stored record (without DB id)."""
     conn = get_connection()
-    cur = conn.cursor()
-    ts = datetime.utcnow().isoformat()
-
-    cur.execute(
-        """
-        INSERT INTO actuation_logs (
-            timestamp, mood, energy, focus, streak_days,
-            lights_json, speaker_json, robot_json
+    us = _now_us()
+
+    with conn:
+        conn.execute(
+            _SQL_INSERT_ACTUATION,
+            (
+                us,
+                mood,
+                energy,
+                focus,
+                int(streak_days),
+                json.dumps(lights),
+                json.dumps(speaker),
+                json.dumps(robot),
+            ),
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-        """,
-        (
-            ts,
-            mood,
-            energy,
-            focus,
-            int(streak_days),
-            json.dumps(lights),
-            json.dumps(speaker),
-            json.dumps(robot),
-        ),
-    )
-
-    conn.commit()
-    conn.close()
 
     return {
-        "timestamp": ts,
+        "timestamp": _us_to_iso(us),
         "mood": mood,
         "energy": energy,
         "focus": focus,
@@ -445,37 +556,111 @@ def insert_actuation(
 
 def get_actuation_history(limit: int = 20) -> List[Dict[str, Any]]:
     """Return recent actuation decisions, newest first."""
+    flush_actuations()
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT timestamp, mood, energy, focus, streak_days,
-               lights_json, speaker_json, robot_json
-        FROM actuation_logs
-        ORDER BY timestamp DESC
-        LIMIT ?;
-        """,
-        (limit,),
-    )
-
-    rows = cur.fetchall()
-    conn.close()
 
     history = []
-    for r in rows:
+    for (
+        ts, mood, energy, focus, streak_days,
+        lights_json, speaker_json, robot_json,
+    ) in conn.execute(_SQL_ACTUATION_HISTORY, (limit,)):
         history.append(
             {
-                "timestamp": r["timestamp"],
-                "mood": r["mood"],
-                "energy": r["energy"],
-                "focus": r["focus"],
-                "streak_days": int(r["streak_days"]),
-                "lights": json.loads(r["lights_json"]),
-                "speaker": json.loads(r["speaker_json"]),
-                "robot": json.loads(r["robot_json"]),
+                "timestamp": _us_to_iso(ts),
+                "mood": mood,
+                "energy": energy,
+                "focus": focus,
+                "streak_days": int(streak_days),
+                "lights": json.loads(lights_json),
+                "speaker": json.loads(speaker_json),
+                "robot": json.loads(robot_json),
             }
         )
 
     return history
 
+
+# -------------------------
+# buffered actuation writes
+# -------------------------
+# /actuate is polled by devices, so its decisions are queued in memory and
+# written in batches (one transaction per flush) instead of one commit per
+# request. Readers of actuation_logs flush first so they never miss a row.
+_ACTUATION_FLUSH_DELAY_S = 0.5
+
+_pending_actuations = deque()
+_flush_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+_flush_conn: sqlite3.Connection | None = None
+
+
+def queue_actuation(
+    mood: str,
+    energy: str,
+    focus: str,
+    streak_days: int,
+    lights: Dict[str, Any],
+    speaker: Dict[str, Any],
+    robot: Dict[str, Any],
+    requested_device: Optional[str] = None,
+) -> None:
+    """Buffer an actuation decision; it is stored by the next flush (within ~500 ms)."""
+    _pending_actuations.append(
+        (
+            _now_us(),
+            mood,
+            energy,
+            focus,
+            int(streak_days),
+            json.dumps(lights),
+            json.dumps(speaker),
+            json.dumps(robot),
+        )
+    )
+
+    with _flush_lock:
+        _arm_flush_timer()
+
+
+def _arm_flush_timer() -> None:
+    """Schedule the next flush unless one is pending; call under _flush_lock."""
+    global _flush_timer
+
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(_ACTUATION_FLUSH_DELAY_S, flush_actuations)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def flush_actuations() -> None:
+    """
+    Write all buffered actuation decisions in a single transaction.
+    On a database error the batch stays queued for the next attempt, so the
+    reader that triggered the flush is never failed by a background write.
+    """
+    global _flush_timer, _flush_conn
+
+    with _flush_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+
+        if not _pending_actuations:
+            return
+
+        rows = []
+        while _pending_actuations:
+            rows.append(_pending_actuations.popleft())
+
+        # Dedicated writer connection, only ever used under _flush_lock
+        if _flush_conn is None:
+            _flush_conn = _connect(check_same_thread=False)
+
+        try:
+            with _flush_conn:
+                _flush_conn.executemany(_SQL_INSERT_ACTUATION, rows)
+        except sqlite3.Error:
+            logger.exception("Failed to store %d queued actuations; retrying", len(rows))
+            # Back in front of anything queued meanwhile, keeping time order
+            _pending_actuations.extendleft(reversed(rows))
+            _arm_flush_timer()